@@ -1,44 +1,82 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request
 from pydantic import BaseModel
-import openai
+from typing import List
+import functools
+import httpx
+import io
+import json
+import logging
 import os
+import time
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
-from fastapi.responses import HTMLResponse, JSONResponse
-from openai import OpenAI  # Update this import
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from openai import AsyncOpenAI
+from common.config import config
+from common.health import add_health_check
+from common.llm_cache import TTLCache, make_key
+from common.logger import get_logger
+from common.pages import StaticPage
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = get_logger("openai_service")
+if config.DEBUG:
+    logger.setLevel(logging.DEBUG)
+
+if not os.getenv("OPENAI_API_KEY"):
+    raise ValueError("OPENAI_API_KEY environment variable is not set")
+
+# Connection pool sizing for outbound OpenAI calls; tune to the account's rate-limit tier
+OAI_MAX_CONN = int(os.getenv("OAI_MAX_CONN", "256"))
+OAI_MAX_KEEPALIVE = int(os.getenv("OAI_MAX_KEEPALIVE", "128"))
+OAI_KEEPALIVE_EXPIRY = float(os.getenv("OAI_KEEPALIVE_EXPIRY", "30"))
+OAI_TIMEOUT = float(os.getenv("OAI_TIMEOUT", "60"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One client (and connection pool) per process, closed on shutdown
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=OAI_MAX_CONN,
+            max_keepalive_connections=OAI_MAX_KEEPALIVE,
+            keepalive_expiry=OAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(OAI_TIMEOUT, connect=5.0),
+        http2=True,
+    )
+    app.state.oai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+    yield
+    await app.state.oai.close()
+    await http_client.aclose()
+
+def get_oai(request: Request) -> AsyncOpenAI:
+    return request.app.state.oai
+
 app = FastAPI(
     title="OpenAI Structured Output Service",
     description="API for OpenAI integration with structured outputs",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
+add_health_check(app, payload={"status": "healthy", "version": "1.0.0"})
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
-# Add CORS middleware with more permissive settings for development
+# Add CORS middleware restricted to the configured origins
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # More permissive for development
+    allow_origins=config.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"]
-)
-
-# Set OpenAI API key from environment
-openai.api_key = os.getenv("OPENAI_API_KEY")
-if not openai.api_key:
-    raise ValueError("OPENAI_API_KEY environment variable is not set")
-
-# After loading environment variables
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
 )
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    return """
+ROOT_PAGE = StaticPage("""
     <html>
         <head>
             <title>OpenAI Service API</title>
@@ -74,17 +112,16 @@ async def root():
             <p>For detailed API documentation and testing interface, visit the <a href="/docs">docs page</a>.</p>
         </body>
     </html>
-    """
+    """)
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "version": "1.0.0"}
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    return ROOT_PAGE.response(request)
 
 @app.get("/function_call/send_email")
 async def send_email_info():
     """Information about the send_email endpoint"""
-    return JSONResponse({
+    return {
         "endpoint": "/function_call/send_email",
         "method": "POST",
         "description": "Send emails using function calling",
@@ -98,12 +135,12 @@ async def send_email_info():
             "model": "gpt-4o",
             "reasoning_effort": 1.0
         }
-    })
+    }
 
 @app.get("/function_call/search_knowledge_base")
 async def search_knowledge_base_info():
     """Information about the search_knowledge_base endpoint"""
-    return JSONResponse({
+    return {
         "endpoint": "/function_call/search_knowledge_base",
         "method": "POST",
         "description": "Search knowledge base using function calling",
@@ -117,65 +154,137 @@ async def search_knowledge_base_info():
             "model": "gpt-4o",
             "reasoning_effort": 1.0
         }
-    })
+    }
+
+# Static tool specifications, built once and shared by every request
+SEND_EMAIL_TOOLS = ({
+    "type": "function",
+    "function": {
+        "name": "send_email",
+        "description": "Send an email to a given recipient with a subject and message.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "to": {
+                    "type": "string",
+                    "description": "The recipient email address."
+                },
+                "subject": {
+                    "type": "string",
+                    "description": "Email subject line."
+                },
+                "body": {
+                    "type": "string",
+                    "description": "Body of the email message."
+                }
+            },
+            "required": ["to", "subject", "body"]
+        }
+    }
+},)
+
+SEARCH_KB_TOOLS = ({
+    "type": "function",
+    "function": {
+        "name": "search_knowledge_base",
+        "description": "Query a knowledge base to retrieve relevant info on a topic.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The user question or search query."
+                },
+                "options": {
+                    "type": "object",
+                    "properties": {
+                        "num_results": {
+                            "type": "number",
+                            "description": "Number of top results to return."
+                        },
+                        "domain_filter": {
+                            "type": ["string", "null"],
+                            "description": "Optional domain to narrow the search (e.g. 'finance', 'medical'). Pass null if not needed."
+                        },
+                        "sort_by": {
+                            "type": ["string", "null"],
+                            "enum": ["relevance", "date", "popularity", "alphabetical"],
+                            "description": "How to sort results. Pass null if not needed."
+                        }
+                    },
+                    "required": ["num_results", "domain_filter", "sort_by"],
+                    "additionalProperties": False
+                }
+            },
+            "required": ["query", "options"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+},)
 
 class FunctionCallRequest(BaseModel):
     model: str
     prompt: str
     reasoning_effort: float
 
+# Generated tool-call arguments keyed by (endpoint, model, prompt, reasoning_effort)
+tool_call_cache = TTLCache(maxsize=1024)
+SEND_EMAIL_CACHE_TTL = 60
+SEARCH_KB_CACHE_TTL = 3600
+
+# Pending OpenAI calls keyed like the cache, so identical concurrent requests share one call
+inflight: dict = {}
+
+def _finish_inflight(key: str, task: asyncio.Task):
+    if inflight.get(key) is task:
+        del inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved; waiting callers re-raise it themselves
+
+async def coalesced(key: str, call):
+    """
+    Await call() once per key; concurrent callers with the same key share its result.
+    The call runs in its own task, so cancelling any caller (the first included)
+    leaves it running for the others.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(call())
+        inflight[key] = task
+        task.add_done_callback(functools.partial(_finish_inflight, key))
+    return await asyncio.shield(task)
+
 @app.post("/function_call/send_email")
-async def send_email_function(request: FunctionCallRequest):
+async def send_email_function(request: FunctionCallRequest, aclient: AsyncOpenAI = Depends(get_oai)):
     """
     Send email using function calling
     """
-    print(f"Received request: {request}")  # Debug log
-    
-    try:
-        # Define the 'send_email' tool specification
-        tools = [{
-            "type": "function",
-            "function": {
-                "name": "send_email",
-                "description": "Send an email to a given recipient with a subject and message.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "to": {
-                            "type": "string",
-                            "description": "The recipient email address."
-                        },
-                        "subject": {
-                            "type": "string",
-                            "description": "Email subject line."
-                        },
-                        "body": {
-                            "type": "string",
-                            "description": "Body of the email message."
-                        }
-                    },
-                    "required": ["to", "subject", "body"]
-                }
-            }
-        }]
+    logger.debug("Received request: %s", request)
+
+    cache_key = make_key("send_email", request.model, request.prompt, request.reasoning_effort)
+    cached = await tool_call_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
+    try:
         try:
-            completion = client.chat.completions.create(
+            completion = await coalesced(cache_key, lambda: aclient.chat.completions.create(
                 model="gpt-4",  # Use a valid model name
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that creates emails."},
                     {"role": "user", "content": request.prompt}
                 ],
-                tools=tools
-            )
+                tools=list(SEND_EMAIL_TOOLS)
+            ))
             
-            print(f"OpenAI response: {completion}")  # Debug log
+            logger.debug("OpenAI response: %s", completion)
             
             # Access the message and tool calls correctly based on the API response structure
             message = completion.choices[0].message
             tool_calls = message.tool_calls if hasattr(message, 'tool_calls') else []
             
-            return {
+            result = {
                 "tool_calls": [
                     {
                         "function": {
@@ -185,16 +294,18 @@ async def send_email_function(request: FunctionCallRequest):
                     } for tool_call in tool_calls
                 ] if tool_calls else []
             }
+            await tool_call_cache.set(cache_key, result, SEND_EMAIL_CACHE_TTL)
+            return result
             
         except Exception as openai_error:
-            print(f"OpenAI API error: {str(openai_error)}")  # Debug log
+            logger.error("OpenAI API error: %s", openai_error)
             raise HTTPException(
                 status_code=500,
                 detail=f"OpenAI API error: {str(openai_error)}"
             )
             
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")  # Debug log
+        logger.error("Unexpected error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"An unexpected error occurred: {str(e)}"
@@ -205,67 +316,110 @@ async def send_email_function(request: FunctionCallRequest):
 # ================================
 
 @app.post("/function_call/search_knowledge_base")
-async def search_knowledge_base_function(request: FunctionCallRequest):
-    # Define the 'search_knowledge_base' tool specification.
-    tools = [{
-        "type": "function",
-        "function": {
-            "name": "search_knowledge_base",
-            "description": "Query a knowledge base to retrieve relevant info on a topic.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "The user question or search query."
-                    },
-                    "options": {
-                        "type": "object",
-                        "properties": {
-                            "num_results": {
-                                "type": "number",
-                                "description": "Number of top results to return."
-                            },
-                            "domain_filter": {
-                                "type": ["string", "null"],
-                                "description": "Optional domain to narrow the search (e.g. 'finance', 'medical'). Pass null if not needed."
-                            },
-                            "sort_by": {
-                                "type": ["string", "null"],
-                                "enum": ["relevance", "date", "popularity", "alphabetical"],
-                                "description": "How to sort results. Pass null if not needed."
-                            }
-                        },
-                        "required": ["num_results", "domain_filter", "sort_by"],
-                        "additionalProperties": False
-                    }
-                },
-                "required": ["query", "options"],
-                "additionalProperties": False
-            },
-            "strict": True
-        }
-    }]
+async def search_knowledge_base_function(request: FunctionCallRequest, aclient: AsyncOpenAI = Depends(get_oai)):
+    cache_key = make_key("search_knowledge_base", request.model, request.prompt, request.reasoning_effort)
+    cached = await tool_call_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     try:
         params = {
             "model": request.model,
             "messages": [{"role": "user", "content": request.prompt}],
-            "tools": tools
+            "tools": list(SEARCH_KB_TOOLS)
         }
         if request.reasoning_effort:
             params["reasoning_effort"] = request.reasoning_effort
 
-        completion = openai.ChatCompletion.create(**params)
-        tool_calls = completion.choices[0].message.get("tool_calls", [])
-        return {"tool_calls": tool_calls}
+        completion = await coalesced(cache_key, lambda: aclient.chat.completions.create(**params))
+        tool_calls = completion.choices[0].message.tool_calls or []
+        result = {"tool_calls": [tool_call.model_dump() for tool_call in tool_calls]}
+        await tool_call_cache.set(cache_key, result, SEARCH_KB_CACHE_TTL)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ================================
+# Batch API endpoints for non-interactive knowledge base searches
+# ================================
+
+class BatchRequest(BaseModel):
+    prompts: List[str]
+    model: str = "gpt-4o"
+
+@app.post("/function_call/search_knowledge_base/batch")
+async def search_knowledge_base_batch(request: BatchRequest, aclient: AsyncOpenAI = Depends(get_oai)):
+    """
+    Submit prompts to the OpenAI Batch API (24h completion window, half the cost)
+    """
+    if not request.prompts:
+        raise HTTPException(status_code=400, detail="prompts must not be empty")
+
+    buf = io.BytesIO()
+    for i, prompt in enumerate(request.prompts):
+        line = {
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": request.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "tools": list(SEARCH_KB_TOOLS)
+            }
+        }
+        buf.write(json.dumps(line).encode("utf-8"))
+        buf.write(b"\n")
+
+    try:
+        batch_file = await aclient.files.create(file=("batch.jsonl", buf.getvalue()), purpose="batch")
+        batch = await aclient.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
     except Exception as e:
+        logger.error("Batch submission failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    return {"batch_id": batch.id, "status": batch.status}
+
+@app.get("/function_call/batch/{batch_id}")
+async def get_batch(batch_id: str, aclient: AsyncOpenAI = Depends(get_oai)):
+    """
+    Report batch status; once completed, return the tool calls per prompt index
+    """
+    try:
+        batch = await aclient.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            return {"batch_id": batch.id, "status": batch.status}
+
+        output = await aclient.files.content(batch.output_file_id)
+    except Exception as e:
+        logger.error("Batch retrieval failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        body = (entry.get("response") or {}).get("body") or {}
+        choices = body.get("choices") or [{}]
+        results[entry["custom_id"]] = {
+            "tool_calls": choices[0].get("message", {}).get("tool_calls") or [],
+            "error": entry.get("error")
+        }
+    return {"batch_id": batch.id, "status": batch.status, "results": results}
 
 @app.middleware("http")
 async def log_requests(request, call_next):
-    print(f"Incoming request: {request.method} {request.url}")
-    print(f"Headers: {request.headers}")
+    start = time.perf_counter()
     response = await call_next(request)
-    print(f"Response status: {response.status_code}")
-    return response 
\ No newline at end of file
+    logger.info(
+        "%s %s %s %.1fms",
+        request.method, request.url.path, response.status_code,
+        (time.perf_counter() - start) * 1000,
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Headers: %s", request.headers)
+    return response
+ 
\ No newline at end of file
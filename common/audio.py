@@ -0,0 +1,17 @@
+import io
+
+import numpy as np
+from faster_whisper.audio import decode_audio as _decode_with_pyav
+
+# Whisper expects mono float32 samples at 16 kHz.
+SAMPLE_RATE = 16000
+
+def decode_audio(audio_bytes: bytes) -> np.ndarray:
+    """Decode an in-memory audio file (WAV, FLAC, webm, m4a, ...) to mono float32 at 16 kHz."""
+    # PyAV/libswresample applies proper anti-aliasing when downsampling 44.1/48 kHz input.
+    return _decode_with_pyav(io.BytesIO(audio_bytes), sampling_rate=SAMPLE_RATE)
+
+def pcm16_to_float32(pcm: bytes) -> np.ndarray:
+    """Convert raw little-endian 16-bit mono PCM (already at 16 kHz) to float32 samples."""
+    usable = len(pcm) - (len(pcm) % 2)
+    return np.frombuffer(pcm[:usable], dtype="<i2").astype(np.float32) / 32768.0
@@ -3,6 +3,17 @@ import os
 class Config:
     SERVICE_NAME = os.getenv("SERVICE_NAME", "unknown_service")
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+    # Comma-separated list of browser origins allowed to call the services.
+    CORS_ORIGINS = [
+        origin.strip()
+        for origin in os.getenv(
+            "CORS_ORIGINS", "http://localhost:3000,http://localhost:5173,http://localhost:8000"
+        ).split(",")
+        if origin.strip()
+    ]
+    REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    # Redis list that video_analysis workers push insight batches onto for the web service to drain.
+    INSIGHTS_KEY = os.getenv("INSIGHTS_KEY", "insights")
     # Add any other common configuration settings here.
 
 config = Config() 
\ No newline at end of file
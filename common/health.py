@@ -0,0 +1,13 @@
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+_HEALTH_BYTES = orjson.dumps({"status": "ok"})
+
+def add_health_check(app: FastAPI, path: str = "/health", payload: dict = None):
+    # The body is encoded once; a fresh Response per request keeps middleware header edits private.
+    body = _HEALTH_BYTES if payload is None else orjson.dumps(payload)
+
+    @app.get(path, include_in_schema=False)
+    async def health_check():
+        return Response(body, media_type="application/json")
@@ -1,11 +1,26 @@
 import logging
+import os
+
+_FORMAT = '[%(levelname)s] %(asctime)s - %(name)s - %(message)s'
+
+def configure_root(level=None):
+    """Configure the root logger once per process; later calls are no-ops."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO").upper())
 
 def get_logger(name: str):
     logger = logging.getLogger(name)
     if not logger.handlers:  # Add a handler only if not already added.
         handler = logging.StreamHandler()
-        formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(name)s - %(message)s')
+        formatter = logging.Formatter(_FORMAT)
         handler.setFormatter(formatter)
         logger.addHandler(handler)
         logger.setLevel(logging.INFO)
-    return logger 
\ No newline at end of file
+        # The logger has its own handler, so don't emit again through the root.
+        logger.propagate = False
+    return logger
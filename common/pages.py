@@ -0,0 +1,27 @@
+import hashlib
+import textwrap
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+
+class StaticPage:
+    """An HTML page encoded once at import and served with conditional GET support."""
+
+    def __init__(self, html: str, max_age: int = 300):
+        self.body = textwrap.dedent(html).encode("utf-8")
+        # Weak, because GZipMiddleware may serve the same page under a different encoding.
+        self.etag = 'W/"%s"' % hashlib.md5(self.body).hexdigest()
+        self.headers = {"ETag": self.etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    def matches(self, if_none_match: str) -> bool:
+        """Weak comparison against an If-None-Match list, as required for GET (RFC 9110 13.1.2)."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == self.etag[2:] for tag in tags)
+
+    def response(self, request: Request) -> Response:
+        # A new response per request: middleware edits response headers in place.
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return HTMLResponse(self.body, headers=self.headers)
@@ -0,0 +1,19 @@
+from functools import lru_cache
+from typing import BinaryIO, Union
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+@lru_cache(maxsize=1)
+def load_whisper_model(size: str = "base") -> WhisperModel:
+    """Load the Whisper model once per process: int8_float16 on GPU, int8 on CPU."""
+    if ctranslate2.get_cuda_device_count() > 0:
+        return WhisperModel(size, device="cuda", compute_type="int8_float16")
+    return WhisperModel(size, device="cpu", compute_type="int8")
+
+def transcribe_text(model: WhisperModel, audio: Union[np.ndarray, BinaryIO]) -> str:
+    """Transcribe 16 kHz mono float32 audio (or an encoded audio file) and join the segment texts."""
+    # Segments are generated lazily; consuming them here keeps decoding on the caller's thread.
+    segments, _ = model.transcribe(audio)
+    return " ".join(segment.text.strip() for segment in segments)
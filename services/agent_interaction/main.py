@@ -1,19 +1,24 @@
-import logging
+import asyncio
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from common.config import config
+from common.health import add_health_check
+from common.logger import configure_root, get_logger
+from common.pages import StaticPage
 
-# Configure logger
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("agent_interaction")
+logger = get_logger("agent_interaction")
 
-app = FastAPI(title="Agent Interaction Service", debug=False)
+app = FastAPI(title="Agent Interaction Service", debug=False, default_response_class=ORJSONResponse)
+add_health_check(app)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Allow CORS for production use
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, restrict origins appropriately.
+    allow_origins=config.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -22,12 +27,12 @@ app.add_middleware(
 # Simple connection manager for WebSocket communication.
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
     
     async def connect(self, websocket: WebSocket):
         try:
             await websocket.accept()
-            self.active_connections.append(websocket)
+            self.active_connections.add(websocket)
             logger.info(f"WebSocket connection established: {websocket.client}")
         except Exception as e:
             logger.exception("Error accepting WebSocket connection")
@@ -35,7 +40,7 @@ class ConnectionManager:
     
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
             logger.info(f"WebSocket connection removed: {websocket.client}")
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
@@ -45,23 +50,23 @@ class ConnectionManager:
             logger.error(f"Error sending personal message: {e}")
             raise e
     
+    async def _safe_send(self, connection: WebSocket, message: str):
+        try:
+            await connection.send_text(message)
+        except Exception as e:
+            logger.error(f"Broadcast error on connection {connection.client}: {e}")
+            self.disconnect(connection)
+
     async def broadcast(self, message: str):
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Broadcast error on connection {connection.client}: {e}")
-                self.disconnect(connection)
+        # Send to all clients concurrently so one slow socket doesn't delay the rest.
+        await asyncio.gather(
+            *(self._safe_send(connection, message) for connection in list(self.active_connections)),
+            return_exceptions=True,
+        )
 
 manager = ConnectionManager()
 
-@app.get("/health", summary="Health Check")
-async def health_check():
-    return {"status": "ok"}
-
-@app.get("/", response_class=HTMLResponse)
-async def get_agent_ui():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -89,8 +94,11 @@ async def get_agent_ui():
         <button onclick="sendMessage()">Send</button>
     </body>
     </html>
-    """
-    return HTMLResponse(html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def get_agent_ui(request: Request):
+    return ROOT_PAGE.response(request)
 
 @app.websocket("/ws/agent")
 async def agent_websocket(websocket: WebSocket):
@@ -111,4 +119,5 @@ async def agent_websocket(websocket: WebSocket):
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 if __name__ == "__main__":
+    configure_root()
     uvicorn.run("services.agent_interaction.main:app", host="0.0.0.0", port=8005, reload=False) 
\ No newline at end of file
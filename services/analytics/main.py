@@ -1,30 +1,32 @@
-import logging
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-import random
+from fastapi.middleware.gzip import GZipMiddleware
+import numpy as np
+from common.config import config
+from common.health import add_health_check
+from common.logger import configure_root, get_logger
+from common.pages import StaticPage
 
-logger = logging.getLogger("analytics")
-logging.basicConfig(level=logging.INFO)
+logger = get_logger("analytics")
 
-app = FastAPI(title="Analytics Service", debug=False)
+rng = np.random.default_rng()
+LABELS_7DAY = tuple(f"Day {i}" for i in range(1, 8))
+
+app = FastAPI(title="Analytics Service", debug=False, default_response_class=ORJSONResponse)
+add_health_check(app)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=config.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-@app.get("/health", summary="Health Check")
-async def health_check():
-    return {"status": "ok"}
-
-@app.get("/", response_class=HTMLResponse)
-async def analytics_dashboard():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -59,18 +61,21 @@ async def analytics_dashboard():
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def analytics_dashboard(request: Request):
+    return ROOT_PAGE.response(request)
 
-@app.get("/data", response_class=JSONResponse)
+@app.get("/data")
 async def get_chart_data():
     try:
-        labels = [f"Day {i}" for i in range(1, 8)]
-        values = [random.randint(5, 20) for _ in range(7)]
-        return {"labels": labels, "values": values}
+        values = rng.integers(5, 21, size=len(LABELS_7DAY)).tolist()
+        return {"labels": LABELS_7DAY, "values": values}
     except Exception as e:
         logger.exception("Error generating chart data")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 if __name__ == "__main__":
+    configure_root()
     uvicorn.run("services.analytics.main:app", host="0.0.0.0", port=8040, reload=False)
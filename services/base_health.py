@@ -1,6 +1,4 @@
-from fastapi import FastAPI
+# Kept for existing imports; the implementation lives in common so service images can ship it.
+from common.health import add_health_check
 
-def add_health_check(app: FastAPI):
-    @app.get("/health")
-    async def health_check():
-        return {"status": "ok"} 
\ No newline at end of file
+__all__ = ["add_health_check"]
@@ -1,35 +1,46 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import List
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+import asyncio
+import time
 import uvicorn
+from common.pages import StaticPage
 
-app = FastAPI(title="Chat History Service", debug=True)
+app = FastAPI(title="Chat History Service", debug=False, default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 class ChatMessage(BaseModel):
     sender: str
     message: str
     timestamp: datetime = None
+    # Integer ordering key for clients that only need to sort messages.
+    ts_ns: Optional[int] = None
 
-# In-memory storage for chat messages.
-chat_history: List[ChatMessage] = []
+# In-memory storage for chat messages, kept as JSON-ready dicts and capped in size.
+CHAT_HISTORY_LIMIT = 10_000
+chat_history: deque[dict] = deque(maxlen=CHAT_HISTORY_LIMIT)
+chat_history_lock = asyncio.Lock()
 
 @app.post("/chat", response_model=ChatMessage)
 async def add_chat(chat: ChatMessage):
     # If no timestamp is provided, assign the current UTC datetime.
     if chat.timestamp is None:
-        chat.timestamp = datetime.utcnow()
-    chat_history.append(chat)
+        chat.timestamp = datetime.now(timezone.utc)
+    chat.ts_ns = time.time_ns()
+    async with chat_history_lock:
+        chat_history.append(chat.model_dump(mode="json"))
     return chat
 
-@app.get("/chat", response_model=List[ChatMessage])
+@app.get("/chat")
 async def get_chats():
-    return chat_history
+    # Stored entries are already serialized, so skip response_model validation.
+    return ORJSONResponse(list(chat_history))
 
-@app.get("/", response_class=HTMLResponse)
-async def chat_page():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -81,8 +92,11 @@ async def chat_page():
         </form>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def chat_page(request: Request):
+    return ROOT_PAGE.response(request)
 
 if __name__ == "__main__":
     uvicorn.run("services.chat_history.main:app", host="0.0.0.0", port=8030, reload=True) 
\ No newline at end of file
@@ -1,22 +1,65 @@
 import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, WebSocket
 from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
+import orjson
 import uvicorn
 
-app = FastAPI(title="Dashboard Service", debug=True)
+# Maximum time a client waits without an update before the current state is resent.
+HEARTBEAT_INTERVAL = 30.0
 
-# Set up Jinja2 templates directory to the copied folder.
-templates = Jinja2Templates(directory="templates")
-
-# Global stats simulation (in production, these would be fetched from other services)
+# Canonical dashboard state shared by all clients (in production, fed by other services).
 global_stats = {
     "active_agents": 5,
     "system_health": "Good",
     "success_rate": "98%",
     "knowledge_nodes": 233,
+    "live_transcription": "",
 }
 
+# Encoded once per change and reused for every connected client.
+_payload = orjson.dumps(global_stats).decode()
+# Replaced on every publish so each waiter wakes exactly once per change.
+_state_changed = asyncio.Event()
+
+def publish_stats(**changes):
+    """
+    Applies changes to the shared state and wakes connected clients if anything differs.
+    """
+    global _payload, _state_changed
+    changes = {k: v for k, v in changes.items() if global_stats.get(k) != v}
+    if not changes:
+        return
+    global_stats.update(changes)
+    _payload = orjson.dumps(global_stats).decode()
+    event, _state_changed = _state_changed, asyncio.Event()
+    event.set()
+
+async def simulate_updates():
+    """
+    Single background producer standing in for real-time data from other modules.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(2)
+        publish_stats(
+            live_transcription="Live transcription update at time " + str(int(loop.time())),
+        )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    updater = asyncio.create_task(simulate_updates())
+    yield
+    updater.cancel()
+
+app = FastAPI(title="Dashboard Service", debug=False, lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Set up Jinja2 templates directory to the copied folder.
+templates = Jinja2Templates(directory="templates")
+
 @app.get("/", response_class=HTMLResponse)
 async def get_dashboard(request: Request):
     """
@@ -28,24 +71,22 @@ async def get_dashboard(request: Request):
 async def dashboard_ws(websocket: WebSocket):
     """
     WebSocket endpoint for pushing live dashboard updates.
-    In production, you'd merge real-time data from your other modules.
+    Sends the current state on connect, then again only when it changes
+    (or after HEARTBEAT_INTERVAL of inactivity).
     """
     await websocket.accept()
     try:
+        await websocket.send_text(_payload)
         while True:
-            # Simulate dynamic updates.
-            await asyncio.sleep(2)
-            update = {
-                "active_agents": global_stats["active_agents"] + 1,  # simulate a change
-                "system_health": global_stats["system_health"],
-                "success_rate": global_stats["success_rate"],
-                "knowledge_nodes": global_stats["knowledge_nodes"] + 5,
-                "live_transcription": "Live transcription update at time " + str(int(asyncio.get_event_loop().time())),
-            }
-            await websocket.send_json(update)
+            changed = _state_changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            await websocket.send_text(_payload)
     except Exception as e:
         print("WebSocket disconnect:", e)
         await websocket.close()
 
 if __name__ == "__main__":
-    uvicorn.run("services.dashboard.main:app", host="0.0.0.0", port=8002, reload=True) 
\ No newline at end of file
+    uvicorn.run("services.dashboard.main:app", host="0.0.0.0", port=8002, reload=True)
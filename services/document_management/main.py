@@ -1,25 +1,53 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from common.config import config
 from common.logger import get_logger
+import aiofiles
+import contextlib
 import os
+import uuid
 
 logger = get_logger("document_management")
 app = FastAPI(title="Document Management Service", debug=config.DEBUG)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 UPLOAD_DIR = "./uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+MAX_UPLOAD = 100 << 20  # 100 MiB
+CHUNK_SIZE = 1 << 20
+
 @app.post("/upload")
 async def upload_document(file: UploadFile = File(...)):
     logger.info(f"Received file upload: {file.filename}")
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
+    filename = os.path.basename(file.filename or "")
+    if filename in ("", ".", ".."):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    # Written under a unique temporary name and moved into place only once complete,
+    # so a failed or rejected upload never truncates or removes an existing document.
+    tmp_path = os.path.join(UPLOAD_DIR, f".{filename}.{uuid.uuid4().hex}.part")
     try:
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Stream to disk in chunks so memory stays flat regardless of upload size.
+        written = 0
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await file.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD:
+                    raise HTTPException(status_code=413, detail="File too large")
+                await f.write(chunk)
+            if config.DEBUG:
+                await f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
         logger.info(f"File saved: {file_path}")
-        return JSONResponse(content={"filename": file.filename, "status": "uploaded"})
+        return JSONResponse(content={"filename": filename, "status": "uploaded"})
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to save file {file.filename}: {str(e)}")
-        raise HTTPException(status_code=500, detail="File upload failed") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="File upload failed")
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
@@ -1,8 +1,33 @@
 import asyncio
+import time
+from contextlib import asynccontextmanager
 import httpx
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from common.health import add_health_check
 
-app = FastAPI(title="Gateway Service", debug=True)
+# Upper bound on how long a single backend probe may hold up /overview.
+SERVICE_TIMEOUT = 2.0
+
+# How long an aggregated /overview result is served before probing again.
+OVERVIEW_TTL = 1.5
+_cache = None  # (monotonic timestamp, result)
+_cache_lock = asyncio.Lock()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared client so probes reuse keep-alive connections across requests.
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(5.0, connect=1.0),
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0),
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(title="Gateway Service", debug=False, default_response_class=ORJSONResponse, lifespan=lifespan)
+add_health_check(app, payload={"status": "ok", "message": "Gateway is running."})
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Define a mapping of service names to their internal health (or default) endpoint URLs.
 SERVICES = {
@@ -17,34 +42,45 @@ SERVICES = {
 }
 
 @app.get("/overview")
-async def overview():
+async def overview(request: Request):
+    global _cache
+    if _cache and time.monotonic() - _cache[0] < OVERVIEW_TTL:
+        return _cache[1]
+    # Concurrent callers queue on the lock and pick up the fresh result.
+    async with _cache_lock:
+        if _cache and time.monotonic() - _cache[0] < OVERVIEW_TTL:
+            return _cache[1]
+        results = await collect_overview(request.app.state.http)
+        _cache = (time.monotonic(), results)
+    return results
+
+async def collect_overview(client: httpx.AsyncClient):
     results = {}
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        tasks = []
-        for service_name, url in SERVICES.items():
-            tasks.append(fetch_service_status(client, service_name, url))
-        responses = await asyncio.gather(*tasks)
-        for service_status in responses:
-            if service_status:
-                results[service_status["service"]] = service_status
+    tasks = []
+    for service_name, url in SERVICES.items():
+        tasks.append(fetch_service_status(client, service_name, url))
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+    for service_name, service_status in zip(SERVICES, responses):
+        if isinstance(service_status, BaseException):
+            service_status = {"service": service_name, "status": "error", "error": str(service_status)}
+        if service_status:
+            results[service_status["service"]] = service_status
     return results
 
 async def fetch_service_status(client: httpx.AsyncClient, service_name: str, url: str):
     try:
-        response = await client.get(url)
+        response = await asyncio.wait_for(client.get(url), timeout=SERVICE_TIMEOUT)
         # If the service returns JSON, parse it; otherwise, return first 200 chars.
         if response.headers.get("content-type", "").startswith("application/json"):
             data = response.json()
         else:
             data = {"text": response.text.strip()[:200]}
         return {"service": service_name, "status": "ok", "data": data}
+    except asyncio.TimeoutError:
+        return {"service": service_name, "status": "error", "error": f"timed out after {SERVICE_TIMEOUT}s"}
     except Exception as e:
         return {"service": service_name, "status": "error", "error": str(e)}
 
-@app.get("/health")
-async def health():
-    return {"status": "ok", "message": "Gateway is running."}
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("services.gateway.main:app", host="0.0.0.0", port=8010, reload=True) 
\ No newline at end of file
@@ -1,26 +1,26 @@
-import logging
 import uvicorn
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from common.config import config
+from common.health import add_health_check
+from common.logger import configure_root, get_logger
 
-logger = logging.getLogger("integration")
-logging.basicConfig(level=logging.INFO)
+logger = get_logger("integration")
 
-app = FastAPI(title="Integration Service", debug=False)
+app = FastAPI(title="Integration Service", debug=False, default_response_class=ORJSONResponse)
+add_health_check(app)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=config.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-@app.get("/health", summary="Health Check")
-async def health_check():
-    return {"status": "ok"}
-
 @app.get("/", response_class=HTMLResponse)
 async def integration_ui():
     html = """
@@ -50,7 +50,7 @@ async def integration_ui():
     """
     return HTMLResponse(html)
 
-@app.get("/sync", response_class=JSONResponse)
+@app.get("/sync")
 async def sync_calendar():
     try:
         # In production, implement actual API calls (with retries, error handling, etc.)
@@ -60,4 +60,5 @@ async def sync_calendar():
         raise HTTPException(status_code=500, detail="Integration Error")
 
 if __name__ == "__main__":
+    configure_root()
     uvicorn.run("services.integration.main:app", host="0.0.0.0", port=8041, reload=False)
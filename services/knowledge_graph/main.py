@@ -1,14 +1,20 @@
-import logging
 import uvicorn
 import asyncio
-from fastapi import FastAPI, WebSocket, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+import sys
+from fastapi import FastAPI, Request, WebSocket, HTTPException
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from common.health import add_health_check
+from common.logger import configure_root, get_logger
+from common.pages import StaticPage
 
-logger = logging.getLogger("knowledge_graph")
-logging.basicConfig(level=logging.INFO)
+logger = get_logger("knowledge_graph")
 
-app = FastAPI(title="Knowledge Graph Explorer", debug=False)
+app = FastAPI(title="Knowledge Graph Explorer", debug=False, default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+add_health_check(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,14 +36,27 @@ graph_data = {
         {"from": "task1", "to": "chat1"}
     ]
 }
-
-@app.get("/health", summary="Health Check")
-async def health_check():
-    return {"status": "ok"}
-
-@app.get("/", response_class=HTMLResponse)
-async def graph_page():
-    html_content = """
+# Index of node ids for O(1) existence checks; kept in sync with graph_data["nodes"].
+_node_ids = {n["id"] for n in graph_data["nodes"]}
+_graph_lock = asyncio.Lock()
+# Maximum time a client waits without an update before the graph is resent,
+# which also surfaces dead sockets that would otherwise linger until the next write.
+HEARTBEAT_INTERVAL = 30.0
+
+# Serialized once per change and shared by GET /graph and every WebSocket client.
+_graph_json = orjson.dumps(graph_data)
+_graph_text = _graph_json.decode()
+# Replaced on every change so each waiting WebSocket wakes exactly once per update.
+_graph_changed = asyncio.Event()
+
+def notify_graph_changed():
+    global _graph_json, _graph_text, _graph_changed
+    _graph_json = orjson.dumps(graph_data)
+    _graph_text = _graph_json.decode()
+    event, _graph_changed = _graph_changed, asyncio.Event()
+    event.set()
+
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -112,22 +131,27 @@ async def graph_page():
         </script>
     </body>
     </html>
-    """
-    return HTMLResponse(html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def graph_page(request: Request):
+    return ROOT_PAGE.response(request)
 
-@app.get("/graph", response_class=JSONResponse)
+@app.get("/graph")
 async def get_graph():
-    return graph_data
+    return Response(_graph_json, media_type="application/json")
 
 @app.post("/knowledge-graph/update", summary="Update Graph")
 async def update_knowledge_graph(node: str, info: str):
     try:
-        exists = any(n["id"] == node for n in graph_data["nodes"])
-        if not exists:
-            graph_data["nodes"].append({"id": node, "label": info, "group": "dynamic"})
-            logger.info(f"Added node {node} with info: {info}")
-        else:
-            logger.info(f"Node {node} already exists; update skipped.")
+        async with _graph_lock:
+            if node not in _node_ids:
+                graph_data["nodes"].append({"id": node, "label": info, "group": "dynamic"})
+                _node_ids.add(node)
+                notify_graph_changed()
+                logger.info(f"Added node {node} with info: {info}")
+            else:
+                logger.info(f"Node {node} already exists; update skipped.")
         return {"status": "node added or exists"}
     except Exception as e:
         logger.exception("Error updating knowledge graph")
@@ -137,12 +161,20 @@ async def update_knowledge_graph(node: str, info: str):
 async def websocket_knowledge_graph(websocket: WebSocket):
     await websocket.accept()
     try:
+        # Send the current graph on connect, then only when it changes
+        # (or after HEARTBEAT_INTERVAL of inactivity).
         while True:
-            await websocket.send_json(graph_data)
-            await asyncio.sleep(5)
+            changed = _graph_changed
+            await websocket.send_text(_graph_text)
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
     except Exception as e:
         logger.exception("WebSocket error in knowledge graph")
         await websocket.close()
 
 if __name__ == "__main__":
-    uvicorn.run("services.knowledge_graph.main:app", host="0.0.0.0", port=8006, reload=False) 
\ No newline at end of file
+    configure_root()
+    uvicorn.run("services.knowledge_graph.main:app", host="0.0.0.0", port=8006, reload=False,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools") 
\ No newline at end of file
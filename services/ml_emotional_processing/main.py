@@ -1,11 +1,43 @@
+import zlib
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from numba import njit
 from pydantic import BaseModel
 from common.config import config
 from common.logger import get_logger
 import numpy as np
 
 logger = get_logger("ml_emotional_processing")
-app = FastAPI(title="ML Emotional Processing Service", debug=config.DEBUG)
+app = FastAPI(title="ML Emotional Processing Service", debug=config.DEBUG, default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+EMOTIONS = ["happy", "sad", "neutral", "angry"]
+VOCAB_SIZE = 4096
+
+_rng = np.random.default_rng()
+
+# Placeholder token -> emotion weights; swap in trained weights of shape (VOCAB_SIZE, len(EMOTIONS)).
+weights = _rng.random((VOCAB_SIZE, len(EMOTIONS)))
+
+@njit(cache=True)
+def _score(tokens: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Sums the weight rows of the given tokens and returns softmax probabilities."""
+    k = weights.shape[1]
+    out = np.zeros(k)
+    for i in range(tokens.shape[0]):
+        for j in range(k):
+            out[j] += weights[tokens[i], j]
+    out = np.exp(out - out.max())
+    return out / out.sum()
+
+def tokenize(text: str) -> np.ndarray:
+    """Hashes lower-cased words into vocabulary indices."""
+    words = text.lower().split()
+    return np.fromiter((zlib.crc32(w.encode()) % VOCAB_SIZE for w in words), dtype=np.int64, count=len(words))
+
+# Compile (or load from cache) now so the first request doesn't pay the JIT cost.
+_score(np.zeros(1, dtype=np.int64), weights)
 
 # Data model for emotion analysis
 class EmotionRequest(BaseModel):
@@ -19,10 +51,8 @@ class EmotionResponse(BaseModel):
 @app.post("/process-emotion", response_model=EmotionResponse)
 async def process_emotion(request: EmotionRequest):
     logger.info(f"Processing emotion for text: {request.text}")
-    # Simulated emotion processing; replace with a real model as needed.
-    emotions = ["happy", "sad", "neutral", "angry"]
-    emotion = np.random.choice(emotions)
-    score = float(np.random.rand())
-    response = EmotionResponse(text=request.text, emotion=emotion, score=score)
+    probs = _score(tokenize(request.text), weights)
+    best = int(probs.argmax())
+    response = EmotionResponse(text=request.text, emotion=EMOTIONS[best], score=float(probs[best]))
     logger.info(f"Emotion processed: {response.emotion} (score: {response.score})")
-    return response 
\ No newline at end of file
+    return response
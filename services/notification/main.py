@@ -1,31 +1,49 @@
 import asyncio
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+import sys
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
+from common.logger import get_logger
+from common.pages import StaticPage
 
-app = FastAPI(title="Notification Service", debug=True)
+logger = get_logger("notification")
+
+app = FastAPI(title="Notification Service", debug=False)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Simple connection manager to handle active WebSocket connections
 class ConnectionManager:
+    # Number of sends awaited together before yielding back to the event loop.
+    BROADCAST_BATCH_SIZE = 50
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
+    async def _safe_send(self, connection: WebSocket, message: str):
+        try:
             await connection.send_text(message)
+        except Exception as e:
+            logger.error(f"Broadcast error on connection {connection.client}: {e}")
+            self.disconnect(connection)
+
+    async def broadcast(self, message: str):
+        clients = list(self.active_connections)
+        for i in range(0, len(clients), self.BROADCAST_BATCH_SIZE):
+            await asyncio.gather(
+                *(self._safe_send(connection, message) for connection in clients[i:i + self.BROADCAST_BATCH_SIZE]),
+                return_exceptions=True,
+            )
 
 manager = ConnectionManager()
 
-@app.get("/")
-async def get_notifications_page():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
         <head>
@@ -44,8 +62,11 @@ async def get_notifications_page():
             </script>
         </body>
     </html>
-    """
-    return HTMLResponse(content=html_content)
+    """)
+
+@app.get("/")
+async def get_notifications_page(request: Request):
+    return ROOT_PAGE.response(request)
 
 @app.websocket("/ws/notifications")
 async def notifications_websocket(websocket: WebSocket):
@@ -56,10 +77,14 @@ async def notifications_websocket(websocket: WebSocket):
             await asyncio.sleep(5)
             message = f"Alert! Notification at time {int(asyncio.get_event_loop().time())}"
             await manager.broadcast(message)
+            # A failed send drops the socket from the manager; stop this client's loop with it.
+            if websocket not in manager.active_connections:
+                break
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
         manager.disconnect(websocket)
 
 if __name__ == "__main__":
-    uvicorn.run("services.notification.main:app", host="0.0.0.0", port=8020, reload=True) 
\ No newline at end of file
+    uvicorn.run("services.notification.main:app", host="0.0.0.0", port=8020, reload=True,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools") 
\ No newline at end of file
@@ -1,12 +1,14 @@
 import uvicorn
-from fastapi import FastAPI
+import sys
+from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from common.pages import StaticPage
 
-app = FastAPI(title="Onboarding Service", debug=True)
+app = FastAPI(title="Onboarding Service", debug=False)
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
-@app.get("/", response_class=HTMLResponse)
-async def onboarding_page():
-    html = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -33,8 +35,12 @@ async def onboarding_page():
         </div>
     </body>
     </html>
-    """
-    return HTMLResponse(html)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def onboarding_page(request: Request):
+    return ROOT_PAGE.response(request)
 
 if __name__ == "__main__":
-    uvicorn.run("services.onboarding.main:app", host="0.0.0.0", port=8042, reload=True)
+    uvicorn.run("services.onboarding.main:app", host="0.0.0.0", port=8042, reload=True,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools")
@@ -1,76 +1,111 @@
-import logging
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
-import threading
+import sys
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from typing import Dict, Optional
+from datetime import datetime, timezone
+import asyncio
+import itertools
+import msgspec
+from common.health import add_health_check
+from common.logger import configure_root, get_logger
+from common.pages import StaticPage
 
-logger = logging.getLogger("task_management")
-logging.basicConfig(level=logging.INFO)
+logger = get_logger("task_management")
 
-app = FastAPI(title="Task Management Service", debug=False)
+app = FastAPI(title="Task Management Service", debug=False, default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+add_health_check(app)
 
-# Thread-safe in-memory store (for production use a persistent DB)
-task_lock = threading.Lock()
-tasks: List["Task"] = []
-next_id = 1
+# In-memory store indexed by task id (for production use a persistent DB)
+task_lock = asyncio.Lock()
+tasks: Dict[int, "Task"] = {}
+_id_gen = itertools.count(1)
 
-class Task(BaseModel):
+class Task(msgspec.Struct, kw_only=True):
     id: int = 0
     title: str
     description: Optional[str] = None
-    created_at: datetime = None
+    created_at: Optional[datetime] = None
     due_date: Optional[datetime] = None
     completed: bool = False
 
-@app.get("/health", summary="Health Check")
-async def health_check():
-    return {"status": "ok"}
-
-@app.post("/tasks", response_model=Task)
-async def create_task(task: Task):
-    global next_id
-    with task_lock:
-        task.id = next_id
-        next_id += 1
-        if task.created_at is None:
-            task.created_at = datetime.utcnow()
-        tasks.append(task)
-        logger.info(f"Task created: {task.id} - {task.title}")
-    return task
-
-@app.get("/tasks", response_model=List[Task])
+DATETIME_FIELDS = ("created_at", "due_date")
+
+# msgspec's schema is used for the OpenAPI docs, since the body is decoded from the raw request.
+TASK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": msgspec.json.schema_components((Task,))[1]["Task"]}},
+    }
+}
+
+def parse_datetime(value):
+    """
+    Accepts the looser ISO 8601 forms msgspec rejects (date-only, no seconds, trailing Z).
+    Unparseable values are returned unchanged so validation reports them.
+    """
+    if value == "":
+        return None
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value[-1:] in "Zz" else value)
+    except ValueError:
+        return value
+
+async def decode_task(request: Request) -> Task:
+    try:
+        data = msgspec.json.decode(await request.body())
+        if isinstance(data, dict):
+            for field in DATETIME_FIELDS:
+                if field in data:
+                    data[field] = parse_datetime(data[field])
+        return msgspec.convert(data, type=Task)
+    except msgspec.ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except msgspec.DecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+def task_response(content) -> Response:
+    return Response(content=msgspec.json.encode(content), media_type="application/json")
+
+@app.post("/tasks", openapi_extra=TASK_BODY)
+async def create_task(request: Request):
+    task = await decode_task(request)
+    # No await between id allocation and insert, so this needs no lock on the event loop.
+    task.id = next(_id_gen)
+    if task.created_at is None:
+        task.created_at = datetime.now(timezone.utc)
+    tasks[task.id] = task
+    logger.info(f"Task created: {task.id} - {task.title}")
+    return task_response(task)
+
+@app.get("/tasks")
 async def get_tasks():
-    with task_lock:
-        return tasks.copy()
-
-@app.put("/tasks/{task_id}", response_model=Task)
-async def update_task(task_id: int, updated_task: Task):
-    with task_lock:
-        for i, task in enumerate(tasks):
-            if task.id == task_id:
-                updated_task.id = task_id
-                tasks[i] = updated_task
-                logger.info(f"Task updated: {task_id}")
-                return updated_task
-    raise HTTPException(status_code=404, detail="Task not found")
+    return task_response(list(tasks.values()))
+
+@app.put("/tasks/{task_id}", openapi_extra=TASK_BODY)
+async def update_task(task_id: int, request: Request):
+    updated_task = await decode_task(request)
+    async with task_lock:
+        if task_id not in tasks:
+            raise HTTPException(status_code=404, detail="Task not found")
+        updated_task.id = task_id
+        tasks[task_id] = updated_task
+        logger.info(f"Task updated: {task_id}")
+    return task_response(updated_task)
 
 @app.delete("/tasks/{task_id}")
 async def delete_task(task_id: int):
-    global tasks
-    with task_lock:
-        initial_count = len(tasks)
-        tasks = [task for task in tasks if task.id != task_id]
-        if len(tasks) == initial_count:
+    async with task_lock:
+        if tasks.pop(task_id, None) is None:
             raise HTTPException(status_code=404, detail="Task not found")
         logger.info(f"Task deleted: {task_id}")
     return {"detail": "Task deleted"}
 
-@app.get("/", response_class=HTMLResponse)
-async def task_page():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
     <head>
@@ -131,8 +166,13 @@ async def task_page():
         </form>
     </body>
     </html>
-    """
-    return HTMLResponse(html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def task_page(request: Request):
+    return ROOT_PAGE.response(request)
 
 if __name__ == "__main__":
-    uvicorn.run("services.task_management.main:app", host="0.0.0.0", port=8007, reload=False) 
\ No newline at end of file
+    configure_root()
+    uvicorn.run("services.task_management.main:app", host="0.0.0.0", port=8007, reload=False,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools") 
\ No newline at end of file
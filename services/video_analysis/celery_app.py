@@ -1,16 +1,24 @@
+import lz4.frame
 from celery import Celery
+from kombu import compression
+from common.config import config
+
+# kombu has no built-in lz4 codec; register it so producer and worker both understand it.
+compression.register(lz4.frame.compress, lz4.frame.decompress, "application/x-lz4", aliases=["lz4"])
 
 # Configure Celery to use Redis as both broker and result backend
 celery_app = Celery(
     "video_analysis",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0"
+    broker=config.REDIS_URL,
+    backend=config.REDIS_URL
 )
 
 celery_app.conf.update(
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["json"],
+    # msgpack carries audio bytes as native binary instead of base64-encoded JSON strings.
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    task_compression="lz4",
     timezone="UTC",
     enable_utc=True,
 ) 
\ No newline at end of file
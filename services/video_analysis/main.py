@@ -1,26 +1,81 @@
 import asyncio
+import io
 import time
-import os
-import tempfile
-
-from fastapi import FastAPI, WebSocket, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, WebSocket, BackgroundTasks
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+import orjson
 import uvicorn
 from pydantic import BaseModel
+import numpy as np
+import redis.asyncio as aioredis
+import webrtcvad
+from common.audio import SAMPLE_RATE, decode_audio
 from common.config import config
 from common.logger import get_logger
-
-# Import Whisper and load the model (ensure openai-whisper is installed)
-import whisper
+from common.pages import StaticPage
+from common.transcription import load_whisper_model, transcribe_text
 
 logger = get_logger("video_analysis")
-app = FastAPI(title="Video Analysis Service", debug=config.DEBUG)
 
 # Global async queue to hold insights for WebSocket clients
 insights_queue = asyncio.Queue()
 
-# Load whisper model once at startup (using the "base" model as an example)
-model = whisper.load_model("base")
+
+async def drain_insights():
+    """
+    Moves insight batches pushed to Redis by Celery workers into insights_queue.
+    """
+    client = aioredis.from_url(config.REDIS_URL)
+    try:
+        while True:
+            try:
+                _, data = await client.blpop(config.INSIGHTS_KEY)
+            except aioredis.RedisError as e:
+                logger.error(f"Insight drain failed: {e}")
+                await asyncio.sleep(1)
+                continue
+            try:
+                insights = orjson.loads(data)
+                if not isinstance(insights, list):
+                    raise ValueError(f"expected a list, got {type(insights).__name__}")
+            except ValueError as e:  # orjson.JSONDecodeError is a ValueError
+                logger.error(f"Dropping malformed insight batch: {e}")
+                continue
+            for insight in insights:
+                await insights_queue.put(insight)
+    finally:
+        await client.close()
+
+
+def _log_drainer_exit(task: asyncio.Task):
+    """
+    Logs if drain_insights ever exits other than by cancellation at shutdown.
+    """
+    if not task.cancelled():
+        logger.error("Insight drain stopped unexpectedly", exc_info=task.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    drainer = asyncio.create_task(drain_insights())
+    drainer.add_done_callback(_log_drainer_exit)
+    yield
+    drainer.cancel()
+    _whisper_pool.shutdown(wait=False)
+
+
+app = FastAPI(title="Video Analysis Service", debug=config.DEBUG, default_response_class=ORJSONResponse, lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Load the faster-whisper model once at startup (using the "base" model as an example)
+model = load_whisper_model("base")
+# Dedicated pool bounds concurrent inference and keeps it off the default executor.
+_whisper_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="whisper")
 
 
 # Data model for video analysis request
@@ -42,28 +97,20 @@ class VideoAnalysisResponse(BaseModel):
 
 async def transcribe_audio(audio_bytes: bytes) -> str:
     """
-    Transcribes audio using OpenAI Whisper.
-    Writes the audio bytes to a temporary WAV file and uses run_in_executor
-    to call the synchronous `model.transcribe` method.
+    Transcribes audio using faster-whisper.
+    The audio bytes are handed over as an in-memory file, so decoding happens
+    inside the `transcribe_text` call on the whisper pool, not on the event loop.
     """
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp.flush()
-        tmp_name = tmp.name
-
-    loop = asyncio.get_event_loop()
     try:
-        result = await loop.run_in_executor(None, model.transcribe, tmp_name)
-        transcription = result.get("text", "")
+        audio = io.BytesIO(audio_bytes)
+        transcription = await asyncio.get_running_loop().run_in_executor(_whisper_pool, transcribe_text, model, audio)
     except Exception as e:
         logger.error(f"Transcription failed: {e}")
         transcription = ""
-    finally:
-        os.unlink(tmp_name)
     return transcription
 
 
-def diarization_processing(file_path: str) -> dict:
+def diarization_processing(audio: np.ndarray) -> dict:
     """
     Placeholder for a production diarization function.
     In practice, integrate with a speaker diarization library (e.g., pyannote.audio).
@@ -73,25 +120,24 @@ def diarization_processing(file_path: str) -> dict:
     return {"speaker_1": "Speaker 1", "speaker_2": "Speaker 2"}
 
 
+def diarize_audio_bytes(audio_bytes: bytes) -> dict:
+    """
+    Decodes the audio bytes in memory and runs diarization on the result.
+    """
+    return diarization_processing(decode_audio(audio_bytes))
+
+
 async def perform_diarization(audio_bytes: bytes) -> dict:
     """
     Performs diarization on the provided audio.
-    Writes the audio bytes to a temporary file and uses run_in_executor
-    to call a synchronous diarization function.
+    Uses run_in_executor so both decoding and the synchronous
+    diarization function stay off the event loop.
     """
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp.flush()
-        tmp_name = tmp.name
-
-    loop = asyncio.get_event_loop()
     try:
-        result = await loop.run_in_executor(None, diarization_processing, tmp_name)
+        result = await asyncio.get_running_loop().run_in_executor(None, diarize_audio_bytes, audio_bytes)
     except Exception as e:
         logger.error(f"Diarization failed: {e}")
         result = {}
-    finally:
-        os.unlink(tmp_name)
     return result
 
 
@@ -112,49 +158,63 @@ async def extract_insights(transcription: str, diarization: dict) -> list:
 
 # --- Video Capture and Processing ---
 
+# Moderately aggressive voice-activity detector used to drop silent chunks before Celery.
+_vad = webrtcvad.Vad(2)
+# webrtcvad accepts 10, 20 or 30 ms frames of 16-bit mono PCM.
+VAD_FRAME_BYTES = SAMPLE_RATE * 30 // 1000 * 2
+
+
+def has_speech(pcm: bytes) -> bool:
+    """
+    Returns True if any 30 ms frame of the raw 16 kHz PCM chunk contains speech.
+    """
+    view = memoryview(pcm)
+    return any(
+        _vad.is_speech(view[i:i + VAD_FRAME_BYTES], SAMPLE_RATE)
+        for i in range(0, len(view) - VAD_FRAME_BYTES + 1, VAD_FRAME_BYTES)
+    )
+
+
 async def process_video_stream(stream_url: str):
     """
     Processes a live video stream by launching FFmpeg to extract audio,
     buffering audio data, and running transcription and diarization in batches.
     """
+    # Emit headerless 16 kHz mono PCM so every chunk can be decoded on its own.
     process = await asyncio.create_subprocess_exec(
         "ffmpeg",
         "-i", stream_url,
-        "-f", "wav",
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", "16000",
         "pipe:1",
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE
     )
 
-    # Use a bytearray to accumulate audio:
-    audio_buffer = bytearray()
-    THRESHOLD = 100000  # bytes; adjust threshold as needed for proper segmentation
+    THRESHOLD = 100000  # bytes (~3 s of 16 kHz mono PCM); adjust as needed for segmentation
 
     while True:
-        chunk = await process.stdout.read(1024)
+        # Read a whole segment at once so it reaches Celery without intermediate copies.
+        try:
+            chunk = await process.stdout.readexactly(THRESHOLD)
+        except asyncio.IncompleteReadError as e:
+            chunk = e.partial  # Shorter final segment at end of stream
         if not chunk:
             break
 
-        audio_buffer.extend(chunk)
-
-        # Once sufficient audio data is accumulated, offload processing to Celery
-        if len(audio_buffer) >= THRESHOLD:
-            current_buffer = bytes(audio_buffer)
-            audio_buffer.clear()
-
-            # Offload heavy processing to Celery using process_audio_chunk task
+        # Offload heavy processing to Celery; workers push insights to Redis,
+        # which drain_insights forwards to insights_queue. Silent chunks are
+        # dropped here so they never reach Whisper.
+        if has_speech(chunk):
             from tasks import process_audio_chunk
-            celery_result = process_audio_chunk.delay(current_buffer)
-
             try:
-                # Use asyncio.to_thread to avoid blocking the event loop while waiting for result.get()
-                insights = await asyncio.to_thread(celery_result.get, 10)
-                for insight in insights:
-                    await insights_queue.put(insight)
+                process_audio_chunk.delay(chunk)
             except Exception as e:
-                logger.error(f"Celery task processing failed: {e}")
+                logger.error(f"Failed to dispatch audio chunk to Celery: {e}")
 
-        await asyncio.sleep(0.1)
+        if len(chunk) < THRESHOLD:
+            break
 
     await process.wait()
 
@@ -174,15 +234,13 @@ async def websocket_insights(websocket: WebSocket):
     try:
         while True:
             insight = await insights_queue.get()
-            await websocket.send_json(insight)
+            await websocket.send_text(orjson.dumps(insight).decode())
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.close()
 
 
-@app.get("/", response_class=HTMLResponse)
-async def get_index():
-    html_content = """
+ROOT_PAGE = StaticPage("""
     <!DOCTYPE html>
     <html>
       <head>
@@ -202,9 +260,13 @@ async def get_index():
         </script>
       </body>
     </html>
-    """
-    return HTMLResponse(content=html_content)
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def get_index(request: Request):
+    return ROOT_PAGE.response(request)
 
 
 if __name__ == "__main__":
-    uvicorn.run("video_analysis.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("video_analysis.main:app", host="0.0.0.0", port=8000, reload=True,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools") 
\ No newline at end of file
@@ -1,29 +1,31 @@
 import time
-import os
-import tempfile
-import asyncio
-import whisper
+import numpy as np
+import orjson
+import redis
 from celery_app import celery_app
+from common.audio import pcm16_to_float32
+from common.config import config
 from common.logger import get_logger
+from common.transcription import load_whisper_model, transcribe_text
 
 logger = get_logger("video_analysis_tasks")
 
-# Load Whisper model once at worker startup (using the "base" model as an example)
-model = whisper.load_model("base")
+# Load the faster-whisper model once at worker startup (using the "base" model as an example)
+model = load_whisper_model("base")
 
-def transcribe_audio_sync(audio_path: str) -> str:
+redis_client = redis.Redis.from_url(config.REDIS_URL)
+
+def transcribe_audio_sync(audio: np.ndarray) -> str:
     """
     Synchronously transcribe audio using the loaded Whisper model.
     """
     try:
-        result = model.transcribe(audio_path)
-        transcription = result.get("text", "")
-        return transcription
+        return transcribe_text(model, audio)
     except Exception as e:
         logger.error(f"Transcription failed: {e}")
         return ""
 
-def diarization_processing(file_path: str) -> dict:
+def diarization_processing(audio: np.ndarray) -> dict:
     """
     Synchronous placeholder for speaker diarization.
     Replace with an integrated diarization library (e.g., pyannote.audio).
@@ -31,12 +33,12 @@ def diarization_processing(file_path: str) -> dict:
     time.sleep(0.5)
     return {"speaker_1": "Speaker 1", "speaker_2": "Speaker 2"}
 
-def perform_diarization_sync(audio_path: str) -> dict:
+def perform_diarization_sync(audio: np.ndarray) -> dict:
     """
     Synchronously perform diarization using a placeholder function.
     """
     try:
-        return diarization_processing(audio_path)
+        return diarization_processing(audio)
     except Exception as e:
         logger.error(f"Diarization failed: {e}")
         return {}
@@ -55,25 +57,21 @@ def extract_insights_sync(transcription: str, diarization: dict) -> list:
         "sentiment": "positive"
     }]
 
-@celery_app.task
+@celery_app.task(ignore_result=True)
 def process_audio_chunk(audio_bytes: bytes):
     """
     Celery task to process an audio chunk.
-    Writes the bytes to a temp file, then synchronously runs transcription,
-    diarization, and insight extraction.
+    Decodes the raw 16 kHz PCM bytes in memory, then synchronously runs
+    transcription, diarization, and insight extraction, and pushes the
+    insights onto the Redis list drained by the web service.
     """
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp.flush()
-        tmp_name = tmp.name
-
     try:
-        transcription = transcribe_audio_sync(tmp_name)
-        diarization = perform_diarization_sync(tmp_name)
+        audio = pcm16_to_float32(audio_bytes)
+        transcription = transcribe_audio_sync(audio)
+        diarization = perform_diarization_sync(audio)
         insights = extract_insights_sync(transcription, diarization)
-        return insights
     except Exception as e:
         logger.error(f"Error processing audio chunk: {e}")
-        return []
-    finally:
-        os.unlink(tmp_name) 
\ No newline at end of file
+        return
+    if insights:
+        redis_client.rpush(config.INSIGHTS_KEY, orjson.dumps(insights)) 
\ No newline at end of file
@@ -1,60 +1,69 @@
 import asyncio
-import os
-import tempfile
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import ahocorasick
 from fastapi import FastAPI, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
-import whisper
+from common.logger import get_logger
+from common.transcription import load_whisper_model, transcribe_text
 
-app = FastAPI(title="Voice Guided Workflow Service", debug=True)
+logger = get_logger("voice_workflow")
 
-# Load Whisper model once at startup (using "base" model as an example)
-model = whisper.load_model("base")
+app = FastAPI(title="Voice Guided Workflow Service", debug=False, default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Load the faster-whisper model once at startup (using "base" model as an example)
+model = load_whisper_model("base")
+# Dedicated pool bounds concurrent inference and keeps it off the default executor.
+_whisper_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="whisper")
 
 async def transcribe_voice(file_bytes: bytes) -> str:
     """
     Asynchronously transcribe the provided voice file
-    using the Whisper model.
+    using the Whisper model. faster-whisper decodes the upload in memory
+    through PyAV, so browser recordings (webm, m4a, mp4) are accepted.
     """
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(file_bytes)
-        tmp.flush()
-        tmp_name = tmp.name
-
-    loop = asyncio.get_event_loop()
     try:
-        result = await loop.run_in_executor(None, model.transcribe, tmp_name)
-        transcription = result.get("text", "")
+        audio = io.BytesIO(file_bytes)
+        transcription = await asyncio.get_running_loop().run_in_executor(_whisper_pool, transcribe_text, model, audio)
     except Exception as e:
+        logger.error(f"Transcription failed: {e}")
         transcription = ""
-    finally:
-        os.unlink(tmp_name)
     return transcription
 
+# Keyword -> (task, details), in priority order when several keywords appear.
+WORKFLOW_KEYWORDS = [
+    ("schedule", ("Schedule Meeting", "Create a calendar event as discussed.")),
+    ("email", ("Send Email", "Compose and send follow-up email.")),
+]
+
+# All keywords compiled into one automaton so a transcription is scanned in a single pass.
+_keywords = ahocorasick.Automaton()
+for _priority, (_keyword, _action) in enumerate(WORKFLOW_KEYWORDS):
+    _keywords.add_word(_keyword, (_priority, _action))
+_keywords.make_automaton()
+
+@lru_cache(maxsize=1024)
+def _parse_cached(transcription: str) -> tuple:
+    """
+    Maps a transcription to an immutable (task, details) pair so results can be memoized.
+    """
+    matches = [value for _, value in _keywords.iter(transcription.lower())]
+    if matches:
+        return min(matches)[1]
+    return ("General Command", transcription)
+
 def parse_workflow_from_transcription(transcription: str) -> dict:
     """
     Dummy parser to extract workflow commands from the text.
     Replace this with a production-ready NLP pipeline.
     """
-    tasks = []
-
-    if "schedule" in transcription.lower():
-        tasks.append({
-            "task": "Schedule Meeting",
-            "details": "Create a calendar event as discussed.",
-        })
-    elif "email" in transcription.lower():
-        tasks.append({
-            "task": "Send Email",
-            "details": "Compose and send follow-up email.",
-        })
-    else:
-        tasks.append({
-            "task": "General Command",
-            "details": transcription
-        })
-
-    return {"tasks": tasks, "raw_transcription": transcription}
+    task, details = _parse_cached(transcription)
+    return {"tasks": [{"task": task, "details": details}], "raw_transcription": transcription}
 
 @app.post("/create-workflow")
 async def create_workflow(file: UploadFile = File(...)):
@@ -62,13 +71,14 @@ async def create_workflow(file: UploadFile = File(...)):
         file_data = await file.read()
         transcription = await transcribe_voice(file_data)
         workflow = parse_workflow_from_transcription(transcription)
-        return JSONResponse(content=workflow)
+        return workflow
     except Exception as e:
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
 
 @app.get("/")
 async def index():
-    return JSONResponse(content={"message": "Voice Guided Workflow Service is running."})
+    return {"message": "Voice Guided Workflow Service is running."}
 
 if __name__ == "__main__":
-    uvicorn.run("voice_workflow.main:app", host="0.0.0.0", port=8001, reload=True) 
\ No newline at end of file
+    uvicorn.run("voice_workflow.main:app", host="0.0.0.0", port=8001, reload=True,
+                loop="auto" if sys.platform == "win32" else "uvloop", http="httptools") 
\ No newline at end of file
@@ -0,0 +1,78 @@
+import asyncio
+import importlib
+
+import pytest
+
+@pytest.fixture
+def app_module(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    try:
+        module = importlib.import_module("backend.openai_service.app")
+    except ImportError as e:
+        pytest.skip(f"openai_service dependencies not installed: {e}")
+    yield module
+    module.inflight.clear()
+
+def make_call(calls, result="ok", delay=0.05, error=None):
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return call
+
+def test_concurrent_callers_share_one_call(app_module):
+    calls = []
+
+    async def run():
+        call = make_call(calls)
+        results = await asyncio.gather(*(app_module.coalesced("k", call) for _ in range(10)))
+        assert results == ["ok"] * 10
+        assert app_module.inflight == {}
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+def test_exception_reaches_every_waiter(app_module):
+    calls = []
+
+    async def run():
+        call = make_call(calls, error=ValueError("boom"))
+        results = await asyncio.gather(
+            *(app_module.coalesced("k", call) for _ in range(5)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) and str(r) == "boom" for r in results)
+        assert app_module.inflight == {}
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+def test_cancelling_first_caller_does_not_cancel_followers(app_module):
+    calls = []
+
+    async def run():
+        call = make_call(calls)
+        first = asyncio.create_task(app_module.coalesced("k", call))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(app_module.coalesced("k", call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await asyncio.gather(*followers) == ["ok"] * 3
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert app_module.inflight == {}
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+def test_later_caller_after_completion_makes_a_new_call(app_module):
+    calls = []
+
+    async def run():
+        call = make_call(calls, delay=0)
+        assert await app_module.coalesced("k", call) == "ok"
+        assert await app_module.coalesced("k", call) == "ok"
+
+    asyncio.run(run())
+    assert len(calls) == 2
@@ -0,0 +1,37 @@
+import asyncio
+
+from common import llm_cache
+from common.llm_cache import TTLCache, make_key
+
+def test_make_key_is_stable_and_order_sensitive():
+    assert make_key("a", {"x": 1, "y": 2}) == make_key("a", {"y": 2, "x": 1})
+    assert make_key("a", "b") != make_key("b", "a")
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache()
+
+    async def run():
+        await cache.set("k", "v", ttl=10)
+        now[0] += 9
+        assert await cache.get("k") == "v"
+        now[0] += 2
+        assert await cache.get("k") is None
+        assert "k" not in cache._data
+
+    asyncio.run(run())
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+
+    async def run():
+        await cache.set("a", 1, ttl=60)
+        await cache.set("b", 2, ttl=60)
+        assert await cache.get("a") == 1  # "b" is now least recently used
+        await cache.set("c", 3, ttl=60)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+
+    asyncio.run(run())
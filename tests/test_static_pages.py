@@ -0,0 +1,43 @@
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+SERVICES = [
+    "backend.openai_service.app",
+    "services.agent_interaction.main",
+    "services.analytics.main",
+    "services.chat_history.main",
+    "services.knowledge_graph.main",
+    "services.notification.main",
+    "services.onboarding.main",
+    "services.task_management.main",
+    "services.video_analysis.main",
+]
+
+@pytest.fixture(params=SERVICES)
+def client(request, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    try:
+        app = importlib.import_module(request.param).app
+    except (ImportError, OSError) as e:  # Missing packages or model weights
+        pytest.skip(f"{request.param} dependencies not available: {e}")
+    return TestClient(app)
+
+def test_root_page_survives_repeated_gzip_requests(client):
+    # GZipMiddleware rewrites response headers in place; a shared response object would be corrupted.
+    for encoding in ("gzip", "gzip", "identity"):
+        response = client.get("/", headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert "<html>" in response.text
+
+def test_root_page_conditional_get(client):
+    etag = client.get("/").headers["etag"]
+    assert etag.startswith('W/"')
+    strong = etag[2:]
+    for if_none_match in (etag, strong, f'"other", {etag}', "*"):
+        response = client.get("/", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert "max-age" in response.headers["cache-control"]
+    assert client.get("/", headers={"If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("msgspec")
+
+from services.task_management.main import app, parse_datetime
+
+client = TestClient(app)
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-05-01", datetime(2024, 5, 1)),
+    ("2024-05-01T10:00", datetime(2024, 5, 1, 10, 0)),
+    ("2024-05-01T10:00:00Z", datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)),
+    ("", None),
+    (None, None),
+    ("garbage", "garbage"),
+])
+def test_parse_datetime(value, expected):
+    assert parse_datetime(value) == expected
+
+@pytest.mark.parametrize("due_date, expected", [
+    ("2024-05-01", "2024-05-01T00:00:00"),
+    ("2024-05-01T10:00", "2024-05-01T10:00:00"),
+    ("2024-05-01T10:00:00Z", "2024-05-01T10:00:00Z"),
+    ("", None),
+])
+def test_create_task_accepts_loose_dates(due_date, expected):
+    response = client.post("/tasks", json={"title": "t", "due_date": due_date})
+    assert response.status_code == 200
+    assert response.json()["due_date"] == expected
+
+def test_update_task_accepts_date_only():
+    task_id = client.post("/tasks", json={"title": "t"}).json()["id"]
+    response = client.put(f"/tasks/{task_id}", json={"title": "u", "due_date": "2024-06-01"})
+    assert response.status_code == 200
+    assert response.json()["due_date"] == "2024-06-01T00:00:00"
+
+def test_invalid_date_is_422():
+    assert client.post("/tasks", json={"title": "t", "due_date": "garbage"}).status_code == 422
+
+def test_non_json_body_is_400():
+    response = client.post("/tasks", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("body", [[1, 2], "task", 3])
+def test_non_object_body_is_422(body):
+    assert client.post("/tasks", json=body).status_code == 422
+
+def test_missing_title_is_422():
+    assert client.post("/tasks", json={"description": "d"}).status_code == 422
+
+def test_request_body_is_documented():
+    spec = client.get("/openapi.json").json()
+    for method, path in (("post", "/tasks"), ("put", "/tasks/{task_id}")):
+        schema = spec["paths"][path][method]["requestBody"]["content"]["application/json"]["schema"]
+        assert "title" in schema["required"]